@@ -1,21 +1,103 @@
 import os
 import csv
 import json
+import hashlib
+import mmap
+import platform
+import re
+import secrets
 import traceback
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Callable
+from functools import lru_cache, partial
+from itertools import islice, tee
+from io import BytesIO
+from typing import List, Dict, Callable, Iterator, Optional, Sequence, Tuple
 
 import pydicom
+from pydicom.dataelem import RawDataElement
+from pydicom.dataset import Dataset
 from pydicom.datadict import tag_for_keyword
-from dicomanonymizer import anonymize, keep
+from pydicom.tag import BaseTag, Tag
+from dicomanonymizer import anonymize_dataset, initialize_actions, keep, simpledicomanonymizer
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON reports, stdlib json otherwise
+    orjson = None
+
+try:
+    import gdcm
+except ImportError:  # optional: C-backed header reader for QC (qc.parser: gdcm)
+    gdcm = None
+
+try:
+    import liburing
+except ImportError:  # optional, Linux only: batched header reads (qc.io_uring)
+    liburing = None
+
+try:
+    import hyperscan
+except ImportError:  # optional: compiled multi-pattern matching for qc.pii_regex_patterns
+    hyperscan = None
+
 
 def load_config(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f) or {}
 
 
+def _json_bytes(data, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # orjson rejects str with lone surrogates, e.g. surrogate-escaped
+            # non-UTF-8 file names; stdlib json escapes them instead
+            pass
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def write_json(path: str, data: dict, pretty: bool = False) -> None:
+    # Reports are compact unless qc.pretty_json asks for indentation.
+    # Top-level values given as iterators (the series array) are written one
+    # item at a time in compact mode so the full list is never built.
+    if pretty:
+        data = {
+            key: list(value) if isinstance(value, Iterator) else value
+            for key, value in data.items()
+        }
+        with open(path, "wb") as f:
+            f.write(_json_bytes(data, pretty=True))
+        return
+
+    with open(path, "wb") as f:
+        f.write(b"{")
+        for i, (key, value) in enumerate(data.items()):
+            if i:
+                f.write(b",")
+            f.write(_json_bytes(key))
+            f.write(b":")
+            if isinstance(value, Iterator):
+                f.write(b"[")
+                for j, item in enumerate(value):
+                    if j:
+                        f.write(b",")
+                    f.write(_json_bytes(item))
+                f.write(b"]")
+            else:
+                f.write(_json_bytes(value))
+        f.write(b"}")
+
+
+def json_line(data: dict) -> bytes:
+    return _json_bytes(data) + b"\n"
+
+
 def load_keep_keywords(json_path: str) -> List[str]:
     with open(json_path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -25,21 +107,54 @@ def load_keep_keywords(json_path: str) -> List[str]:
     return keywords
 
 
-def build_keep_tags_from_keywords(keywords: List[str]) -> List[tuple]:
+@lru_cache(maxsize=None)
+def _kw_to_tag(kw: str) -> Optional[Tuple[int, int]]:
+    raw_tag = tag_for_keyword(kw)
+    if raw_tag is None:
+        return None
+    try:
+        group = raw_tag.group
+        element = raw_tag.element
+    except AttributeError:
+        group = raw_tag >> 16
+        element = raw_tag & 0xFFFF
+    return (group, element)
+
+
+@lru_cache(maxsize=None)
+def _build_keep_tags(keywords: Tuple[str, ...]) -> Tuple[tuple, ...]:
     tags: List[tuple] = []
     for kw in keywords:
-        raw_tag = tag_for_keyword(kw)
-        if raw_tag is None:
+        tag = _kw_to_tag(kw)
+        if tag is None:
             print(f"[WARN] Unknown DICOM keyword in keep list: {kw}")
             continue
-        try:
-            group = raw_tag.group
-            element = raw_tag.element
-        except AttributeError:
-            group = raw_tag >> 16
-            element = raw_tag & 0xFFFF
-        tags.append((group, element))
-    return tags
+        tags.append(tag)
+    return tuple(tags)
+
+
+def build_keep_tags_from_keywords(keywords: Sequence[str]) -> List[tuple]:
+    if not isinstance(keywords, tuple):
+        # Deduplicate in order so the memoized key is stable for the same keep list
+        keywords = tuple(dict.fromkeys(keywords))
+    return list(_build_keep_tags(keywords))
+
+
+# (extra rules dict, dicomanonymizer defaults merged with it) for the rules
+# dict passed most recently; holding the dict keeps its id from being reused
+_merged_actions: list = [None, None]
+
+
+def _anonymization_actions(anon_rules: Dict[tuple, Callable]) -> Dict[tuple, Callable]:
+    # dicomanonymizer rebuilds its default action table on every call; merge
+    # the extra rules over the defaults once and reuse the table for as long
+    # as the same rules dict is passed. Rules dicts must not be mutated
+    # between calls.
+    if _merged_actions[0] is not anon_rules:
+        actions = initialize_actions()
+        actions.update(anon_rules)
+        _merged_actions[:] = [anon_rules, actions]
+    return _merged_actions[1]
 
 
 def anonymize_file(
@@ -47,13 +162,149 @@ def anonymize_file(
     out_path: str,
     anon_rules: Dict[tuple, Callable],
     delete_private_tags: bool,
-) -> None:
-    anonymize(
-        in_path,
-        out_path,
-        anon_rules,
+) -> Dataset:
+    actions = _anonymization_actions(anon_rules)
+    ds = pydicom.dcmread(in_path)
+    anonymize_dataset(
+        ds,
+        None,
         delete_private_tags=delete_private_tags,
+        base_rules_gen=lambda: actions,
     )
+    # Write next to the target and rename so an interrupted run never leaves a
+    # truncated file that a resumed run would mistake for a finished one
+    tmp_path = out_path + ".part"
+    try:
+        ds.save_as(tmp_path)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return ds
+
+
+def _ext_filter(valid_exts) -> Optional[Callable[[str], bool]]:
+    # str.endswith takes a tuple, so one C-level call replaces splitext + set
+    # lookup. An "" entry keeps its splitext meaning of "no extension" (common
+    # for DICOM) rather than matching every name.
+    if not valid_exts:
+        return None
+    suffixes = tuple(ext for ext in valid_exts if ext)
+    if "" not in valid_exts:
+        return lambda fname: fname.lower().endswith(suffixes)
+
+    def matches(fname: str) -> bool:
+        fname = fname.lower()
+        if suffixes and fname.endswith(suffixes):
+            return True
+        return "." not in fname.lstrip(".")
+
+    return matches
+
+
+def _dir_prefix(dirpath: str) -> str:
+    # Per-file paths are built as prefix + name; os.path.join is only needed
+    # once per directory
+    return dirpath if dirpath.endswith(os.sep) else dirpath + os.sep
+
+
+def _scan_tree(top: str) -> Iterator[Tuple[str, List[str]]]:
+    # Top-down equivalent of os.walk that only keeps file names; DirEntry
+    # caches the type from the directory listing so no extra stat is needed.
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(top) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    files.append(entry.name)
+    except OSError:
+        return
+
+    yield top, files
+    for subdir in subdirs:
+        yield from _scan_tree(subdir)
+
+
+def load_uid_salt(salt_path: str, resume: bool) -> str:
+    # The salt is persisted so a resumed run maps UIDs exactly like the run it
+    # continues. Anyone holding it together with the original UIDs can
+    # recompute the mapping, so main keeps it outside output_root.
+    if resume and os.path.isfile(salt_path):
+        with open(salt_path, "r", encoding="utf-8") as f:
+            uid_salt = f.read().strip()
+        if uid_salt:
+            return uid_salt
+        print(f"[WARN] {salt_path} is empty; generating a new UID salt.")
+
+    uid_salt = secrets.token_hex(16)
+    dirpath = os.path.dirname(salt_path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    fd = os.open(salt_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(uid_salt + "\n")
+    return uid_salt
+
+
+def _install_uid_salt(uid_salt: str) -> None:
+    # dicomanonymizer caches old->new UIDs in a module-level dict, which is not
+    # shared between worker processes or kept across runs. Derive replacement
+    # UIDs from a salt instead so e.g. StudyInstanceUID stays consistent
+    # across files, workers and resumed runs.
+    def salted_uid(old_uid: str) -> str:
+        digest = hashlib.sha256(f"{uid_salt}{old_uid}".encode("utf-8")).digest()
+        return f"2.25.{int.from_bytes(digest[:16], 'big')}"
+
+    simpledicomanonymizer.get_UID = salted_uid
+
+
+def _error_row(in_path: str, out_path: str, e: Exception) -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "input_path": in_path,
+        "output_path": out_path,
+        "error_type": type(e).__name__,
+        "message": str(e),
+        "traceback": traceback.format_exc().strip().replace("\n", " | "),
+    }
+
+
+def _anonymize_one(
+    paths: Tuple[str, str],
+    anon_rules: Dict[tuple, Callable],
+    delete_private_tags: bool,
+) -> Tuple[bool, Optional[dict], None]:
+    in_path, out_path = paths
+    try:
+        anonymize_file(in_path, out_path, anon_rules, delete_private_tags)
+        return True, None, None
+    except Exception as e:
+        return False, _error_row(in_path, out_path, e), None
+
+
+def _pipeline_file(
+    paths: Tuple[str, str],
+    anon_rules: Dict[tuple, Callable],
+    delete_private_tags: bool,
+    qc_keyword_tags: List[List[Tuple[str, BaseTag]]],
+) -> Tuple[bool, Optional[dict], Optional[List[Dict[str, str]]]]:
+    in_path, out_path = paths
+    try:
+        ds = anonymize_file(in_path, out_path, anon_rules, delete_private_tags)
+    except Exception as e:
+        return False, _error_row(in_path, out_path, e), None
+    # Run the QC scans on the dataset still in memory instead of re-reading
+    # out_path from disk afterwards
+    return True, None, [_header_values(ds, keyword_tags) for keyword_tags in qc_keyword_tags]
+
+
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
 
 
 def anonymize_tree(
@@ -63,57 +314,137 @@ def anonymize_tree(
     anon_rules: Dict[tuple, Callable],
     delete_private_tags: bool,
     valid_exts: set,
-) -> None:
-    errors: List[dict] = []
+    max_workers: Optional[int] = None,
+    fused_qc: Optional["_FusedQC"] = None,
+    resume: bool = True,
+    uid_salt: Optional[str] = None,
+) -> set:
     num_processed = 0
     num_failed = 0
+    num_skipped = 0
 
-    for root, _, files in os.walk(input_root):
+    ext_ok = _ext_filter(valid_exts)
+    pairs: List[Tuple[str, str]] = []
+    for root, files in _scan_tree(input_root):
         rel_path = os.path.relpath(root, input_root)
         out_dir = os.path.join(output_root, rel_path)
         os.makedirs(out_dir, exist_ok=True)
 
+        in_prefix = _dir_prefix(root)
+        out_prefix = _dir_prefix(out_dir)
         for fname in files:
-            ext = os.path.splitext(fname)[1].lower()
-            if valid_exts and ext not in valid_exts:
+            if ext_ok is not None and not ext_ok(fname):
                 continue
 
-            in_path = os.path.join(root, fname)
-            out_path = os.path.join(out_dir, fname)
+            out_path = f"{out_prefix}{fname}"
+            if resume:
+                try:
+                    if os.stat(out_path).st_size > 0:
+                        num_skipped += 1
+                        continue
+                except OSError:
+                    pass
+
+            pairs.append((f"{in_prefix}{fname}", out_path))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if fused_qc is None:
+        worker = partial(
+            _anonymize_one,
+            anon_rules=anon_rules,
+            delete_private_tags=delete_private_tags,
+        )
+    else:
+        worker = partial(
+            _pipeline_file,
+            anon_rules=anon_rules,
+            delete_private_tags=delete_private_tags,
+            qc_keyword_tags=[keyword_tags for _, keyword_tags in fused_qc.accumulators],
+        )
+    qc_checked: set = set()
 
-            try:
-                anonymize_file(in_path, out_path, anon_rules, delete_private_tags)
+    def handle(results) -> None:
+        nonlocal num_processed, num_failed
+        for (_, out_path), (ok, err, qc_values) in zip(pairs, results):
+            if ok:
                 num_processed += 1
-            except Exception as e:
-                num_failed += 1
-                errors.append({
-                    "timestamp": datetime.now().isoformat(timespec="seconds"),
-                    "input_path": in_path,
-                    "output_path": out_path,
-                    "error_type": type(e).__name__,
-                    "message": str(e),
-                    "traceback": traceback.format_exc().strip().replace("\n", " | "),
-                })
-                print(f"[ERROR] {in_path} -> {e}")
-
-    if errors:
-        write_errors_csv(error_csv, errors)
-        print(f"Wrote {len(errors)} errors to {error_csv}")
+                if fused_qc is not None and fused_qc.add(out_path, qc_values):
+                    qc_checked.add(os.path.normpath(out_path))
+                continue
+            num_failed += 1
+            errors.write(err)
+            print(f"[ERROR] {err['input_path']} -> {err['message']}")
+
+    if uid_salt is None:
+        uid_salt = secrets.token_hex(16)
+    # The serial path runs in this process, so it needs the same mapping
+    _install_uid_salt(uid_salt)
+
+    errors = ErrorCsvWriter(error_csv)
+    try:
+        if max_workers > 1 and len(pairs) > PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_install_uid_salt,
+                initargs=(uid_salt,),
+            ) as executor:
+                handle(executor.map(worker, pairs, chunksize=32))
+        else:
+            handle(map(worker, pairs))
+    finally:
+        errors.close()
+
+    if errors.num_rows:
+        print(f"Wrote {errors.num_rows} errors to {error_csv}")
     else:
         print("No errors encountered during anonymization.")
 
-    print(f"Anonymization summary: processed={num_processed}, failed={num_failed}")
+    print(
+        f"Anonymization summary: processed={num_processed}, failed={num_failed}, "
+        f"skipped={num_skipped}"
+    )
+    return qc_checked
+
+
+ERROR_CSV_FLUSH_EVERY = 1000
 
 
-def write_errors_csv(path: str, rows: List[dict]) -> None:
+class ErrorCsvWriter:
+    # Rows are written as failures happen instead of being held until the end
+    # of the run; the file is only created once the first error arrives.
     fieldnames = ["timestamp", "input_path", "output_path", "error_type", "message", "traceback"]
-    dirpath = os.path.dirname(path)
-    if dirpath:
-        os.makedirs(dirpath, exist_ok=True)
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+
+    def __init__(self, path: str):
+        self.path = path
+        self.num_rows = 0
+        self._f = None
+        self._writer = None
+
+    def write(self, row: dict) -> None:
+        if self._f is None:
+            dirpath = os.path.dirname(self.path)
+            if dirpath:
+                os.makedirs(dirpath, exist_ok=True)
+            self._f = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._f, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self.num_rows += 1
+        if self.num_rows % ERROR_CSV_FLUSH_EVERY == 0:
+            self._f.flush()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+
+
+def _summary_sidecar_path(ndjson_path: str) -> str:
+    return os.path.splitext(ndjson_path)[0] + ".summary.json"
+
+
+def _violations_sidecar_path(ndjson_path: str) -> str:
+    return os.path.splitext(ndjson_path)[0] + ".violations.ndjson"
 
 
 # PatientID deliberately not included here so it is not treated as PII
@@ -135,109 +466,506 @@ DEFAULT_PII_KEYWORDS = [
 ]
 
 
-def run_qc_check(
-    qc_root: str,
-    valid_exts: set,
-    qc_json_path: str,
-    qc_json_detailed_path: str,
-    keep_patient_id: bool,
-    keep_series_instance_uid: bool,
-    pii_keywords: List[str],
-) -> None:
-    summary_counts = {kw: 0 for kw in pii_keywords}
-    num_files_checked = 0
-    num_files_with_unexpected_pii = 0
-    violations = []
+def _is_within(path: str, root: str) -> bool:
+    path = os.path.normpath(os.path.abspath(path))
+    root = os.path.normpath(os.path.abspath(root))
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
 
-    series_data: Dict[str, dict] = {}
-    file_entries: List[dict] = []
 
-    for root, _, files in os.walk(qc_root):
-        dicom_files = []
-        for fname in files:
-            ext = os.path.splitext(fname)[1].lower()
-            if valid_exts and ext not in valid_exts:
-                continue
-            dicom_files.append(fname)
+def _series_names(root: str, qc_root: str) -> Tuple[str, str]:
+    rel_path = os.path.relpath(root, qc_root)
+    folder_name = os.path.basename(root)
+    if rel_path == ".":
+        folder_name = os.path.basename(qc_root.rstrip(os.sep))
+    return rel_path, folder_name
+
+
+def _iter_qc_files(qc_root: str, valid_exts: set) -> Iterator[Tuple[str, str, str, str, str]]:
+    ext_ok = _ext_filter(valid_exts)
+    for root, files in _scan_tree(qc_root):
+        if ext_ok is not None:
+            dicom_files = [fname for fname in files if ext_ok(fname)]
+        else:
+            dicom_files = files
 
         if not dicom_files:
             continue
 
-        rel_path = os.path.relpath(root, qc_root)
-        series_key = rel_path
-        folder_name = os.path.basename(root)
-        if rel_path == ".":
-            folder_name = os.path.basename(qc_root.rstrip(os.sep))
+        rel_path, folder_name = _series_names(root, qc_root)
+        prefix = _dir_prefix(root)
+        for fname in dicom_files:
+            yield root, rel_path, folder_name, fname, f"{prefix}{fname}"
+
+
+def _keyword_tags(keywords: List[str]) -> List[Tuple[str, BaseTag]]:
+    # Resolve keywords once so the per-file loop can skip Dataset.__getattr__;
+    # unknown keywords are dropped since they can never be present.
+    pairs = []
+    for kw in keywords:
+        tag = _kw_to_tag(kw)
+        if tag is not None:
+            pairs.append((kw, Tag(tag)))
+    return pairs
+
+
+def _header_values(ds: Dataset, keyword_tags: List[Tuple[str, BaseTag]]) -> Dict[str, str]:
+    values = {}
+    for kw, tag in keyword_tags:
+        elem = ds.get(tag)
+        if elem is None or elem.value is None:
+            continue
+        val_str = str(elem.value).strip()
+        if not val_str:
+            continue
+        values[kw] = val_str
+    return values
+
+
+def _fast_read_tags(path: str, keyword_tags: List[Tuple[str, BaseTag]]) -> Dict[str, str]:
+    # GDCM parses the header in C; only the selected raw values are handed to
+    # pydicom for decoding so reported strings match the pydicom parser.
+    # ReadUpToTag is used rather than ReadSelectedTags, which can silently
+    # miss elements in files whose VR encoding does not match the header.
+    wanted = [gdcm.Tag(0x0008, 0x0005)]  # SpecificCharacterSet, to decode text
+    for _, tag in keyword_tags:
+        wanted.append(gdcm.Tag(tag.group, tag.element))
+
+    reader = gdcm.Reader()
+    reader.SetFileName(path)
+    if not reader.ReadUpToTag(gdcm.Tag(0x7FE0, 0x0010), gdcm.TagSetType()):
+        raise IOError(f"GDCM could not read {path}")
+
+    gdcm_ds = reader.GetFile().GetDataSet()
+    is_implicit_vr = reader.GetFile().GetHeader().GetDataSetTransferSyntax().IsImplicit()
+    raw_elements = {}
+    for gdcm_tag in wanted:
+        if not gdcm_ds.FindDataElement(gdcm_tag):
+            continue
+        de = gdcm_ds.GetDataElement(gdcm_tag)
+        if de.IsEmpty():
+            continue
+        byte_value = de.GetByteValue()
+        if byte_value is None:
+            # Sequences and encapsulated values are left to pydicom
+            raise ValueError(f"GDCM returned no byte value for {gdcm_tag}")
+        value = byte_value.GetBuffer().encode("utf-8", "surrogateescape")
+        vr = str(de.GetVR())
+        tag = Tag(gdcm_tag.GetGroup(), gdcm_tag.GetElement())
+        # GDCM hands values back in little endian regardless of the file
+        raw_elements[tag] = RawDataElement(
+            tag,
+            None if vr == "??" else vr,
+            len(value),
+            value,
+            0,
+            is_implicit_vr,
+            True,
+        )
+    return _header_values(Dataset(raw_elements), keyword_tags)
+
+
+IO_URING_BATCH = 128
+IO_URING_READ_SIZE = 64 * 1024
+QC_INFLIGHT_PER_WORKER = 64
+
+
+def _bounded_map(executor, fn: Callable, *iterables, window: int) -> Iterator:
+    # Like executor.map, but pulls arguments lazily and keeps at most `window`
+    # calls in flight, so prefetched buffers and pending futures stay bounded
+    pending = deque()
+    for args in zip(*iterables):
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _uring_submit(ring, cqe, prep: Callable, ops) -> Dict[int, int]:
+    count = 0
+    for key, *args in ops:
+        sqe = liburing.io_uring_get_sqe(ring)
+        prep(sqe, *args)
+        liburing.io_uring_sqe_set_data64(sqe, key)
+        count += 1
+    if count:
+        liburing.io_uring_submit_and_wait(ring, count)
+
+    # The bindings cannot index several CQEs reliably once the ring wraps, so
+    # consume one at a time; this does not enter the kernel while completions
+    # are already queued.
+    results = {}
+    for _ in range(count):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        entry = cqe[0]
+        try:
+            results[entry.user_data] = entry.res
+        except OSError as e:
+            results[entry.user_data] = -(e.errno or 1)
+        liburing.io_uring_cq_advance(ring, 1)
+    return results
+
+
+def _uring_read_headers(paths: Iterator[str]) -> Iterator[Optional[memoryview]]:
+    # Prefetch the first IO_URING_READ_SIZE bytes of every file, batching the
+    # open/read/close of IO_URING_BATCH files into one submission each. Yields
+    # None where the ring could not read a file so the caller reads the path.
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    try:
+        liburing.io_uring_queue_init(IO_URING_BATCH, ring)
+    except OSError as e:
+        print(f"[QC WARN] io_uring unavailable ({e}); reading headers normally.")
+        for _ in paths:
+            yield None
+        return
+
+    paths = iter(paths)
+    try:
+        while True:
+            batch = list(islice(paths, IO_URING_BATCH))
+            if not batch:
+                break
+            fds = _uring_submit(
+                ring, cqe, liburing.io_uring_prep_open,
+                ((i, path, os.O_RDONLY) for i, path in enumerate(batch)),
+            )
+            opened = [i for i in range(len(batch)) if fds.get(i, -1) >= 0]
+            bufs = {i: bytearray(IO_URING_READ_SIZE) for i in opened}
+            sizes = _uring_submit(
+                ring, cqe, liburing.io_uring_prep_read,
+                ((i, fds[i], bufs[i], 0) for i in opened),
+            )
+            _uring_submit(
+                ring, cqe, liburing.io_uring_prep_close,
+                ((i, fds[i]) for i in opened),
+            )
+            for i in range(len(batch)):
+                size = sizes.get(i, -1)
+                yield memoryview(bufs[i])[:size] if size >= 0 else None
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+
+def _dcmread_mmap(path: str, specific_tags: List[BaseTag]) -> Dataset:
+    # Parsing straight from the mapping lets the kernel fault in only the
+    # header pages and skips the buffered-reader copy
+    with open(path, "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty and special files cannot be mapped
+            return pydicom.dcmread(fh, stop_before_pixels=True, specific_tags=specific_tags)
+        with mm:
+            try:
+                return pydicom.dcmread(mm, stop_before_pixels=True, specific_tags=specific_tags)
+            except Exception:
+                # mmap.seek() rejects offsets past the end where a file object
+                # does not, so truncated files pydicom can read from a file
+                # fail here; re-read those through the file handle
+                pass
+        fh.seek(0)
+        return pydicom.dcmread(fh, stop_before_pixels=True, specific_tags=specific_tags)
+
+
+def _read_header(
+    path: str,
+    header: Optional[memoryview] = None,
+    *,
+    keyword_tags: List[Tuple[str, BaseTag]],
+    specific_tags: List[BaseTag],
+    parser: str = "pydicom",
+    use_mmap: bool = True,
+) -> Tuple[str, Optional[Dict[str, str]], Optional[Exception]]:
+    if parser == "gdcm":
+        try:
+            return path, _fast_read_tags(path, keyword_tags), None
+        except Exception:
+            pass  # retry with pydicom, which also reports unreadable files
 
-        if series_key not in series_data:
-            series_data[series_key] = {
+    if header is not None:
+        fp = BytesIO(header)
+        try:
+            ds = pydicom.dcmread(fp, stop_before_pixels=True, specific_tags=specific_tags)
+        except Exception:
+            ds = None
+        # A short read holds the whole file; otherwise the prefetched bytes are
+        # only trusted if parsing stopped at PixelData before running off them
+        if ds is not None and (len(header) < IO_URING_READ_SIZE or fp.tell() < len(header)):
+            return path, _header_values(ds, keyword_tags), None
+
+    try:
+        if use_mmap:
+            ds = _dcmread_mmap(path, specific_tags)
+        else:
+            ds = pydicom.dcmread(path, stop_before_pixels=True, specific_tags=specific_tags)
+    except Exception as e:
+        return path, None, e
+    return path, _header_values(ds, keyword_tags), None
+
+
+class PIIPatternMatcher:
+    # Screens QC values against qc.pii_regex_patterns. Hyperscan compiles all
+    # patterns into one database scanned in a single pass per value; Python re
+    # is used when it is not installed or rejects one of the patterns.
+    def __init__(self, patterns: List[str]):
+        # Patterns Python re cannot compile are reported and left out, so
+        # `patterns` is exactly the set in effect
+        compiled = []
+        self.rejected: List[str] = []
+        for pattern in patterns:
+            try:
+                compiled.append((pattern, re.compile(pattern)))
+            except re.error as e:
+                print(f"[QC WARN] Ignoring invalid PII regex {pattern!r}: {e}")
+                self.rejected.append(pattern)
+        self.patterns = [pattern for pattern, _ in compiled]
+        self.backend = "re"
+        self._db = None
+        self._scratch = None
+        if hyperscan is not None and self.patterns:
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[p.encode("utf-8") for p in self.patterns],
+                    ids=list(range(len(self.patterns))),
+                    elements=len(self.patterns),
+                    flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self.patterns),
+                )
+                self._db = db
+                self._scratch = hyperscan.Scratch(db)
+                self.backend = "hyperscan"
+            except hyperscan.error as e:
+                print(f"[QC WARN] hyperscan could not compile qc.pii_regex_patterns ({e}); using re.")
+
+        if self._db is None:
+            self._compiled = compiled
+            # One combined search rejects non-matching values before the
+            # per-pattern pass that works out which patterns hit
+            self._combined = re.compile("|".join(f"(?:{p})" for p, _ in compiled)) if compiled else None
+
+    def match(self, value: str) -> List[str]:
+        if self._db is not None:
+            hits: List[int] = []
+            self._db.scan(
+                value.encode("utf-8", "surrogateescape"),
+                match_event_handler=_collect_hyperscan_id,
+                context=hits,
+                scratch=self._scratch,
+            )
+            return [self.patterns[i] for i in sorted(hits)]
+        if self._combined is None or self._combined.search(value) is None:
+            return []
+        return [pattern for pattern, rx in self._compiled if rx.search(value)]
+
+
+def _collect_hyperscan_id(pattern_id, start, end, flags, hits) -> None:
+    hits.append(pattern_id)
+
+
+class _QCAccumulator:
+    # Per-series aggregation for one QC report; per-file records are streamed
+    # to the detailed NDJSON file as they arrive so memory stays O(series).
+    def __init__(
+        self,
+        keywords: List[str],
+        values_field: str,
+        detailed_path: str,
+        matcher: Optional[PIIPatternMatcher] = None,
+    ):
+        self.keywords = keywords
+        self.values_field = values_field
+        self.detailed_path = detailed_path
+        self.summary_counts = Counter(dict.fromkeys(keywords, 0))
+        self.num_files_checked = 0
+        self.series_data: Dict[str, dict] = {}
+        self.matcher = matcher
+        self.num_files_flagged = 0
+        # Regex hits are streamed to their own NDJSON; only counts stay here
+        self.violations_path = None
+        self._violations_f = None
+        if matcher is not None:
+            self.violations_by_keyword = Counter(dict.fromkeys(keywords, 0))
+            self.violations_by_pattern = Counter(dict.fromkeys(matcher.patterns, 0))
+        # Column-major value sets: only (keyword, series) pairs that actually
+        # have a value get a set, instead of one per keyword for every series
+        self.values_by_kw: Dict[str, Dict[str, set]] = {kw: defaultdict(set) for kw in keywords}
+
+        dirpath = os.path.dirname(detailed_path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        self._detailed_f = open(detailed_path, "wb")
+        if matcher is not None:
+            self.violations_path = _violations_sidecar_path(detailed_path)
+            self._violations_f = open(self.violations_path, "wb")
+
+    def add_series(self, root: str, rel_path: str, folder_name: str) -> dict:
+        series_info = self.series_data.get(rel_path)
+        if series_info is None:
+            series_info = self.series_data[rel_path] = {
                 "series_name": folder_name,
                 "relative_path": rel_path,
                 "series_path": root,
                 "num_files": 0,
-                "pii_values": {kw: set() for kw in pii_keywords},
+            }
+        return series_info
+
+    def add_file(
+        self, root: str, rel_path: str, folder_name: str, path: str, file_vals: Dict[str, str]
+    ) -> None:
+        self.num_files_checked += 1
+        series_info = self.add_series(root, rel_path, folder_name)
+        series_info["num_files"] += 1
+
+        if file_vals:
+            self.summary_counts.update(file_vals.keys())
+            values_by_kw = self.values_by_kw
+            for kw, val_str in file_vals.items():
+                values_by_kw[kw][rel_path].add(val_str)
+
+            if self.matcher is not None:
+                self._screen(path, rel_path, file_vals)
+
+            self._detailed_f.write(json_line({
+                "file": path,
+                "series_relative_path": rel_path,
+                "series_name": folder_name,
+                self.values_field: file_vals,
+            }))
+
+    def _screen(self, path: str, rel_path: str, file_vals: Dict[str, str]) -> None:
+        flagged = False
+        for kw, val_str in file_vals.items():
+            matched = self.matcher.match(val_str)
+            if matched:
+                flagged = True
+                self.violations_by_keyword[kw] += 1
+                self.violations_by_pattern.update(matched)
+                self._violations_f.write(json_line({
+                    "file": path,
+                    "series_relative_path": rel_path,
+                    "keyword": kw,
+                    "value": val_str,
+                    "patterns": matched,
+                }))
+        if flagged:
+            self.num_files_flagged += 1
+
+    def iter_series(self) -> Iterator[dict]:
+        for series_key in sorted(self.series_data.keys()):
+            info = self.series_data[series_key]
+            values_out = {}
+            for kw, values_by_series in self.values_by_kw.items():
+                if series_key in values_by_series:
+                    values_out[kw] = sorted(values_by_series[series_key])
+            yield {
+                "series_name": info["series_name"],
+                "relative_path": info["relative_path"],
+                "series_path": info["series_path"],
+                "num_files": info["num_files"],
+                self.values_field: values_out,
             }
 
-        series_info = series_data[series_key]
-
-        for fname in dicom_files:
-            path = os.path.join(root, fname)
-            try:
-                ds = pydicom.dcmread(path, stop_before_pixels=True)
-            except Exception as e:
-                print(f"[QC WARN] Could not read {path}: {e}")
+    def close(self) -> None:
+        self._detailed_f.close()
+        if self._violations_f is not None:
+            self._violations_f.close()
+
+
+class _FusedQC:
+    # Feeds datasets anonymized by anonymize_tree straight into the QC
+    # accumulators when QC runs on the anonymization output root.
+    def __init__(self, qc_root: str, valid_exts: set, accumulators: List[Tuple[_QCAccumulator, List[Tuple[str, BaseTag]]]]):
+        self.qc_root = qc_root
+        self.ext_ok = _ext_filter(valid_exts)
+        self.accumulators = accumulators
+
+    def add(self, out_path: str, qc_values: List[Dict[str, str]]) -> bool:
+        path = os.path.normpath(out_path)
+        if not _is_within(path, self.qc_root):
+            return False
+        if self.ext_ok is not None and not self.ext_ok(os.path.basename(path)):
+            return False
+        root = os.path.dirname(path)
+        rel_path, folder_name = _series_names(root, self.qc_root)
+        for (acc, _), file_vals in zip(self.accumulators, qc_values):
+            acc.add_file(root, rel_path, folder_name, path, file_vals)
+        return True
+
+
+def _scan_qc_entries(
+    acc: _QCAccumulator,
+    entries: Iterator[Tuple[str, str, str, str, str]],
+    warn_prefix: str,
+    io_workers: int = 16,
+    parser: str = "pydicom",
+    io_uring: bool = False,
+    use_mmap: bool = True,
+    skip_paths: frozenset = frozenset(),
+) -> None:
+    def pending():
+        # Every series is registered, even if all its files are skipped or unreadable
+        for entry in entries:
+            acc.add_series(entry[0], entry[1], entry[2])
+            if skip_paths and os.path.normpath(entry[4]) in skip_paths:
                 continue
+            yield entry
+
+    # Only parse the elements we report on
+    keyword_tags = _keyword_tags(acc.keywords)
+    reader = partial(
+        _read_header,
+        keyword_tags=keyword_tags,
+        specific_tags=[tag for _, tag in keyword_tags],
+        parser=parser,
+        use_mmap=use_mmap,
+    )
 
-            num_files_checked += 1
-            series_info["num_files"] += 1
-
-            file_pii = {}
-
-            for kw in pii_keywords:
-                val = getattr(ds, kw, None)
-                if val is None:
-                    continue
-                val_str = str(val).strip()
-                if not val_str:
-                    continue
+    def read_entry(entry, header=None):
+        return entry, reader(entry[4], header)
+
+    # Entries are pulled from the tree walk as work completes, so in-flight
+    # futures (and io_uring buffers) are capped by the window, not the tree size
+    window = max(io_workers * QC_INFLIGHT_PER_WORKER, IO_URING_BATCH)
+    with ThreadPoolExecutor(max_workers=io_workers) as executor:
+        if io_uring:
+            # Parse on the pool while the ring prefetches the next batches
+            todo, to_prefetch = tee(pending())
+            headers = _uring_read_headers(entry[4] for entry in to_prefetch)
+            results = _bounded_map(executor, read_entry, todo, headers, window=window)
+        else:
+            results = _bounded_map(executor, read_entry, pending(), window=window)
+        for (root, rel_path, folder_name, _, _), (path, file_vals, error) in results:
+            if error is not None:
+                print(f"[{warn_prefix} WARN] Could not read {path}: {error}")
+                continue
+            acc.add_file(root, rel_path, folder_name, path, file_vals)
 
-                summary_counts[kw] += 1
-                series_info["pii_values"][kw].add(val_str)
-                file_pii[kw] = val_str
 
-            if file_pii:
-                file_entries.append({
-                    "file": path,
-                    "series_relative_path": rel_path,
-                    "series_name": folder_name,
-                    "pii_values": file_pii,
-                })
-
-    series_list = []
-    for series_key in sorted(series_data.keys()):
-        info = series_data[series_key]
-        pii_out = {}
-        for kw, values in info["pii_values"].items():
-            if values:
-                pii_out[kw] = sorted(values)
-        series_list.append({
-            "series_name": info["series_name"],
-            "relative_path": info["relative_path"],
-            "series_path": info["series_path"],
-            "num_files": info["num_files"],
-            "pii_values": pii_out,
-        })
+def _write_qc_report(
+    acc: _QCAccumulator,
+    qc_root: str,
+    qc_json_path: str,
+    keep_patient_id: bool,
+    keep_series_instance_uid: bool,
+    pretty_json: bool = False,
+) -> None:
+    num_series = len(acc.series_data)
 
     rules_block = {
         "keep_patient_id": keep_patient_id,
         "keep_series_instance_uid": keep_series_instance_uid,
-        "pii_keywords": pii_keywords,
+        "pii_keywords": acc.keywords,
+        "pii_regex_patterns": acc.matcher.patterns if acc.matcher is not None else [],
+        "pii_regex_patterns_rejected": acc.matcher.rejected if acc.matcher is not None else [],
     }
     summary_block = {
-        "num_files_checked": num_files_checked,
-        "num_series_with_dicoms": len(series_list),
-        "num_files_with_unexpected_pii": num_files_with_unexpected_pii,
-        "pii_counts_by_keyword": summary_counts,
+        "num_files_checked": acc.num_files_checked,
+        "num_series_with_dicoms": num_series,
+        "num_files_with_unexpected_pii": acc.num_files_flagged,
+        "pii_counts_by_keyword": acc.summary_counts,
+        "violations_by_keyword": acc.violations_by_keyword if acc.matcher is not None else {},
+        "violations_by_pattern": acc.violations_by_pattern if acc.matcher is not None else {},
     }
 
     qc_data = {
@@ -245,137 +973,58 @@ def run_qc_check(
         "qc_root": qc_root,
         "rules": rules_block,
         "summary": summary_block,
-        "series": series_list,
-        "violations": violations,
+        "series": acc.iter_series(),
+        # One record per regex hit; null when qc.pii_regex_patterns is unset
+        "violations_ndjson": acc.violations_path,
     }
 
     dirpath = os.path.dirname(qc_json_path)
     if dirpath:
         os.makedirs(dirpath, exist_ok=True)
-    with open(qc_json_path, "w", encoding="utf-8") as f:
-        json.dump(qc_data, f, indent=2)
+    write_json(qc_json_path, qc_data, pretty_json)
 
-    qc_data_detailed = {
+    qc_data_detailed_summary = {
         "generated_at": datetime.now().isoformat(timespec="seconds"),
         "qc_root": qc_root,
         "rules": rules_block,
         "summary": summary_block,
-        "files": file_entries,
+        "files_ndjson": acc.detailed_path,
     }
 
-    dirpath2 = os.path.dirname(qc_json_detailed_path)
-    if dirpath2:
-        os.makedirs(dirpath2, exist_ok=True)
-    with open(qc_json_detailed_path, "w", encoding="utf-8") as f:
-        json.dump(qc_data_detailed, f, indent=2)
+    qc_json_detailed_summary_path = _summary_sidecar_path(acc.detailed_path)
+    write_json(qc_json_detailed_summary_path, qc_data_detailed_summary, pretty_json)
 
     print(f"[QC] Wrote PII series JSON: {qc_json_path}")
-    print(f"[QC] Wrote PII detailed JSON: {qc_json_detailed_path}")
+    print(f"[QC] Wrote PII detailed NDJSON: {acc.detailed_path}")
+    print(f"[QC] Wrote PII detailed summary JSON: {qc_json_detailed_summary_path}")
+    if acc.violations_path is not None:
+        print(f"[QC] Wrote PII regex violations NDJSON: {acc.violations_path}")
     print(
-        f"PII QC summary: files_checked={num_files_checked}, "
-        f"series_with_dicoms={len(series_list)}"
+        f"PII QC summary: files_checked={acc.num_files_checked}, "
+        f"series_with_dicoms={num_series}, "
+        f"files_with_unexpected_pii={acc.num_files_flagged}"
     )
 
 
-def run_keep_keywords_check(
+def _write_keep_report(
+    acc: _QCAccumulator,
     qc_root: str,
-    valid_exts: set,
     keep_json_path: str,
-    keep_keywords: List[str],
     keep_patient_id: bool,
     keep_series_instance_uid: bool,
+    pretty_json: bool = False,
 ) -> None:
-    summary_counts = {kw: 0 for kw in keep_keywords}
-    num_files_checked = 0
-
-    series_data: Dict[str, dict] = {}
-    file_entries: List[dict] = []
-
-    for root, _, files in os.walk(qc_root):
-        dicom_files = []
-        for fname in files:
-            ext = os.path.splitext(fname)[1].lower()
-            if valid_exts and ext not in valid_exts:
-                continue
-            dicom_files.append(fname)
-
-        if not dicom_files:
-            continue
-
-        rel_path = os.path.relpath(root, qc_root)
-        series_key = rel_path
-        folder_name = os.path.basename(root)
-        if rel_path == ".":
-            folder_name = os.path.basename(qc_root.rstrip(os.sep))
-
-        if series_key not in series_data:
-            series_data[series_key] = {
-                "series_name": folder_name,
-                "relative_path": rel_path,
-                "series_path": root,
-                "num_files": 0,
-                "keep_values": {kw: set() for kw in keep_keywords},
-            }
-
-        series_info = series_data[series_key]
-
-        for fname in dicom_files:
-            path = os.path.join(root, fname)
-            try:
-                ds = pydicom.dcmread(path, stop_before_pixels=True)
-            except Exception as e:
-                print(f"[KEEP-QC WARN] Could not read {path}: {e}")
-                continue
-
-            num_files_checked += 1
-            series_info["num_files"] += 1
-
-            file_vals = {}
-
-            for kw in keep_keywords:
-                val = getattr(ds, kw, None)
-                if val is None:
-                    continue
-                val_str = str(val).strip()
-                if not val_str:
-                    continue
-
-                summary_counts[kw] += 1
-                series_info["keep_values"][kw].add(val_str)
-                file_vals[kw] = val_str
-
-            if file_vals:
-                file_entries.append({
-                    "file": path,
-                    "series_relative_path": rel_path,
-                    "series_name": folder_name,
-                    "keep_values": file_vals,
-                })
-
-    series_list = []
-    for series_key in sorted(series_data.keys()):
-        info = series_data[series_key]
-        keep_out = {}
-        for kw, values in info["keep_values"].items():
-            if values:
-                keep_out[kw] = sorted(values)
-        series_list.append({
-            "series_name": info["series_name"],
-            "relative_path": info["relative_path"],
-            "series_path": info["series_path"],
-            "num_files": info["num_files"],
-            "keep_values": keep_out,
-        })
+    num_series = len(acc.series_data)
 
     rules_block = {
         "keep_patient_id": keep_patient_id,
         "keep_series_instance_uid": keep_series_instance_uid,
-        "keep_keywords": keep_keywords,
+        "keep_keywords": acc.keywords,
     }
     summary_block = {
-        "num_files_checked": num_files_checked,
-        "num_series_with_dicoms": len(series_list),
-        "keep_counts_by_keyword": summary_counts,
+        "num_files_checked": acc.num_files_checked,
+        "num_series_with_dicoms": num_series,
+        "keep_counts_by_keyword": acc.summary_counts,
     }
 
     keep_qc_data = {
@@ -383,23 +1032,136 @@ def run_keep_keywords_check(
         "qc_root": qc_root,
         "rules": rules_block,
         "summary": summary_block,
-        "series": series_list,
-        "files": file_entries,
+        "series": acc.iter_series(),
+        "files_ndjson": acc.detailed_path,
     }
 
     dirpath = os.path.dirname(keep_json_path)
     if dirpath:
         os.makedirs(dirpath, exist_ok=True)
-    with open(keep_json_path, "w", encoding="utf-8") as f:
-        json.dump(keep_qc_data, f, indent=2)
+    write_json(keep_json_path, keep_qc_data, pretty_json)
 
     print(f"[KEEP-QC] Wrote keep-keywords JSON: {keep_json_path}")
+    print(f"[KEEP-QC] Wrote keep-keywords detailed NDJSON: {acc.detailed_path}")
     print(
-        f"Keep-keywords QC summary: files_checked={num_files_checked}, "
-        f"series_with_dicoms={len(series_list)}"
+        f"Keep-keywords QC summary: files_checked={acc.num_files_checked}, "
+        f"series_with_dicoms={num_series}"
     )
 
 
+def run_qc_check(
+    qc_root: str,
+    valid_exts: set,
+    qc_json_path: str,
+    qc_json_detailed_path: str,
+    keep_patient_id: bool,
+    keep_series_instance_uid: bool,
+    pii_keywords: List[str],
+    io_workers: int = 16,
+    parser: str = "pydicom",
+    io_uring: bool = False,
+    use_mmap: bool = True,
+    pii_matcher: Optional[PIIPatternMatcher] = None,
+    pretty_json: bool = False,
+) -> None:
+    acc = _QCAccumulator(pii_keywords, "pii_values", qc_json_detailed_path, pii_matcher)
+    try:
+        _scan_qc_entries(
+            acc, _iter_qc_files(qc_root, valid_exts), "QC",
+            io_workers=io_workers, parser=parser, io_uring=io_uring, use_mmap=use_mmap,
+        )
+    finally:
+        acc.close()
+    _write_qc_report(
+        acc, qc_root, qc_json_path, keep_patient_id, keep_series_instance_uid, pretty_json
+    )
+
+
+def run_keep_keywords_check(
+    qc_root: str,
+    valid_exts: set,
+    keep_json_path: str,
+    keep_json_detailed_path: str,
+    keep_keywords: List[str],
+    keep_patient_id: bool,
+    keep_series_instance_uid: bool,
+    io_workers: int = 16,
+    parser: str = "pydicom",
+    io_uring: bool = False,
+    use_mmap: bool = True,
+    pretty_json: bool = False,
+) -> None:
+    acc = _QCAccumulator(keep_keywords, "keep_values", keep_json_detailed_path)
+    try:
+        _scan_qc_entries(
+            acc, _iter_qc_files(qc_root, valid_exts), "KEEP-QC",
+            io_workers=io_workers, parser=parser, io_uring=io_uring, use_mmap=use_mmap,
+        )
+    finally:
+        acc.close()
+    _write_keep_report(
+        acc, qc_root, keep_json_path, keep_patient_id, keep_series_instance_uid, pretty_json
+    )
+
+
+def run_anonymization_with_qc(
+    an_kwargs: dict,
+    qc_root: str,
+    valid_exts: set,
+    qc_json_path: str,
+    qc_json_detailed_path: str,
+    keep_json_path: Optional[str],
+    keep_json_detailed_path: Optional[str],
+    pii_keywords: List[str],
+    keep_keywords: Optional[List[str]],
+    keep_patient_id: bool,
+    keep_series_instance_uid: bool,
+    io_workers: int = 16,
+    parser: str = "pydicom",
+    io_uring: bool = False,
+    use_mmap: bool = True,
+    pii_matcher: Optional[PIIPatternMatcher] = None,
+    pretty_json: bool = False,
+) -> None:
+    # QC of files written by this run comes from the in-memory anonymized
+    # datasets; anything else under qc_root (older outputs, failed files) is
+    # still read from disk so the reports cover the same files as run_qc_check.
+    accumulators = [
+        (_QCAccumulator(pii_keywords, "pii_values", qc_json_detailed_path, pii_matcher), "QC")
+    ]
+    if keep_keywords is not None:
+        accumulators.append(
+            (_QCAccumulator(keep_keywords, "keep_values", keep_json_detailed_path), "KEEP-QC")
+        )
+    try:
+        fused_qc = _FusedQC(
+            qc_root,
+            valid_exts,
+            [(acc, _keyword_tags(acc.keywords)) for acc, _ in accumulators],
+        )
+        qc_checked = frozenset(anonymize_tree(fused_qc=fused_qc, **an_kwargs))
+
+        for acc, warn_prefix in accumulators:
+            _scan_qc_entries(
+                acc, _iter_qc_files(qc_root, valid_exts), warn_prefix,
+                io_workers=io_workers, parser=parser, io_uring=io_uring, use_mmap=use_mmap,
+                skip_paths=qc_checked,
+            )
+    finally:
+        for acc, _ in accumulators:
+            acc.close()
+
+    _write_qc_report(
+        accumulators[0][0], qc_root, qc_json_path,
+        keep_patient_id, keep_series_instance_uid, pretty_json,
+    )
+    if keep_keywords is not None:
+        _write_keep_report(
+            accumulators[1][0], qc_root, keep_json_path,
+            keep_patient_id, keep_series_instance_uid, pretty_json,
+        )
+
+
 def main(config_path: str = "config.yaml") -> None:
     config = load_config(config_path)
     config_dir = os.path.dirname(os.path.abspath(config_path))
@@ -428,9 +1190,28 @@ def main(config_path: str = "config.yaml") -> None:
         an_input_root = os.path.abspath(an_input_root)
         an_output_root = os.path.abspath(an_output_root)
 
-    an_valid_exts = set(anonymization_cfg.get("valid_extensions", [".dcm", ".dicom"]))
+    an_valid_exts = frozenset(
+        ext.lower() for ext in anonymization_cfg.get("valid_extensions", [".dcm", ".dicom"])
+    )
     delete_private_tags = bool(anonymization_cfg.get("delete_private_tags", True))
     extra_keep_keywords = anonymization_cfg.get("extra_keep_keywords", []) or []
+    an_max_workers = int(anonymization_cfg.get("max_workers") or os.cpu_count() or 1)
+    an_resume = bool(anonymization_cfg.get("resume", True))
+
+    an_uid_salt_path = None
+    if run_anonymization:
+        an_uid_salt_path = anonymization_cfg.get("uid_salt_path")
+        if not an_uid_salt_path:
+            # Next to the output tree, not inside it, so it is not shipped with the data
+            an_uid_salt_path = os.path.normpath(an_output_root) + ".uid_salt.txt"
+        elif not os.path.isabs(an_uid_salt_path):
+            an_uid_salt_path = os.path.join(config_dir, an_uid_salt_path)
+        an_uid_salt_path = os.path.abspath(an_uid_salt_path)
+        if _is_within(an_uid_salt_path, an_output_root):
+            raise ValueError(
+                f"'anonymization.uid_salt_path' ({an_uid_salt_path}) must be outside output_root; "
+                "the salt lets anyone with the original UIDs recompute the mapping"
+            )
 
     keep_keywords_all = list(base_keep_keywords) + list(extra_keep_keywords)
     if keep_patient_id and "PatientID" not in keep_keywords_all:
@@ -438,7 +1219,9 @@ def main(config_path: str = "config.yaml") -> None:
     if keep_series_instance_uid and "SeriesInstanceUID" not in keep_keywords_all:
         keep_keywords_all.append("SeriesInstanceUID")
 
-    keep_tags = build_keep_tags_from_keywords(keep_keywords_all)
+    # Deduplicated and sorted once; shared by the keep rules and keep-keywords QC
+    keep_keywords_sorted = tuple(sorted(set(keep_keywords_all)))
+    keep_tags = build_keep_tags_from_keywords(keep_keywords_sorted)
     anon_rules = {tag: keep for tag in keep_tags}
 
     an_log_dir = None
@@ -454,6 +1237,22 @@ def main(config_path: str = "config.yaml") -> None:
     qc_cfg = config.get("qc", {}) or {}
     run_qc = bool(qc_cfg.get("enabled", True))
     inspect_keep_keywords = bool(qc_cfg.get("inspect_keep_keywords", False))
+    qc_io_workers = int(qc_cfg.get("io_workers") or 16)
+    qc_parser = qc_cfg.get("parser") or "pydicom"
+    if qc_parser not in ("pydicom", "gdcm"):
+        raise ValueError(f"Unknown 'qc.parser' in config.yaml: {qc_parser} (use 'pydicom' or 'gdcm')")
+    if qc_parser == "gdcm" and gdcm is None:
+        print("[WARN] qc.parser is 'gdcm' but python-gdcm is not installed; using pydicom.")
+        qc_parser = "pydicom"
+    qc_use_mmap = bool(qc_cfg.get("mmap", True))
+    qc_pretty_json = bool(qc_cfg.get("pretty_json", False))
+    qc_io_uring = bool(qc_cfg.get("io_uring", False))
+    if qc_io_uring and (platform.system() != "Linux" or liburing is None):
+        print("[WARN] qc.io_uring needs Linux and the liburing package; reading headers normally.")
+        qc_io_uring = False
+    if qc_io_uring and qc_parser == "gdcm":
+        print("[WARN] qc.io_uring only applies to the pydicom parser; ignoring it.")
+        qc_io_uring = False
 
     qc_root = qc_cfg.get("root")
     if run_qc:
@@ -467,14 +1266,16 @@ def main(config_path: str = "config.yaml") -> None:
                 )
         qc_root = os.path.abspath(qc_root)
 
-    qc_valid_exts = set(
-        qc_cfg.get("valid_extensions", list(an_valid_exts) if run_anonymization else [".dcm", ".dicom"])
+    qc_valid_exts = frozenset(
+        ext.lower()
+        for ext in qc_cfg.get("valid_extensions", list(an_valid_exts) if run_anonymization else [".dcm", ".dicom"])
     )
 
     qc_log_dir = None
     qc_json_path = None
     qc_json_detailed_path = None
     keep_keywords_json_path = None
+    keep_keywords_json_detailed_path = None
     if run_qc:
         qc_log_dir = qc_cfg.get("log_dir") or "logs_qc"
         if not os.path.isabs(qc_log_dir):
@@ -484,7 +1285,7 @@ def main(config_path: str = "config.yaml") -> None:
         qc_json_path = os.path.join(qc_log_dir, qc_json_filename)
 
         qc_json_detailed_filename = qc_cfg.get(
-            "qc_json_detailed_filename", "anonymization_qc_detailed.json"
+            "qc_json_detailed_filename", "anonymization_qc_detailed.ndjson"
         )
         qc_json_detailed_path = os.path.join(qc_log_dir, qc_json_detailed_filename)
 
@@ -493,10 +1294,20 @@ def main(config_path: str = "config.yaml") -> None:
         )
         keep_keywords_json_path = os.path.join(qc_log_dir, keep_keywords_json_filename)
 
+        keep_keywords_json_detailed_filename = qc_cfg.get(
+            "keep_keywords_json_detailed_filename",
+            "anonymization_keep_keywords_qc_detailed.ndjson",
+        )
+        keep_keywords_json_detailed_path = os.path.join(
+            qc_log_dir, keep_keywords_json_detailed_filename
+        )
+
         os.makedirs(qc_log_dir, exist_ok=True)
 
     pii_keywords = qc_cfg.get("pii_keywords") or DEFAULT_PII_KEYWORDS
     pii_keywords = [kw for kw in pii_keywords if kw != "PatientID"]
+    pii_regex_patterns = [str(p) for p in (qc_cfg.get("pii_regex_patterns") or [])]
+    pii_matcher = PIIPatternMatcher(pii_regex_patterns) if run_qc and pii_regex_patterns else None
 
     print("============================================================")
     print("CONFIG SUMMARY")
@@ -515,19 +1326,30 @@ def main(config_path: str = "config.yaml") -> None:
         print(f"log_dir            : {an_log_dir}")
         print(f"valid_extensions   : {sorted(an_valid_exts)}")
         print(f"delete_private     : {delete_private_tags}")
+        print(f"max_workers        : {an_max_workers}")
+        print(f"resume             : {an_resume}")
+        print(f"uid_salt_path      : {an_uid_salt_path}")
     print("============================================================\n")
 
-    if run_anonymization:
-        anonymize_tree(
-            input_root=an_input_root,
-            output_root=an_output_root,
-            error_csv=error_csv,
-            anon_rules=anon_rules,
-            delete_private_tags=delete_private_tags,
-            valid_exts=an_valid_exts,
-        )
-    else:
+    an_kwargs = dict(
+        input_root=an_input_root,
+        output_root=an_output_root,
+        error_csv=error_csv,
+        anon_rules=anon_rules,
+        delete_private_tags=delete_private_tags,
+        valid_exts=an_valid_exts,
+        max_workers=an_max_workers,
+        resume=an_resume,
+        uid_salt=load_uid_salt(an_uid_salt_path, an_resume) if run_anonymization else None,
+    )
+    # QC on the anonymization output can reuse the datasets written by this
+    # run instead of walking and re-reading the output tree afterwards
+    fuse_qc = run_anonymization and run_qc and _is_within(qc_root, an_output_root)
+
+    if not run_anonymization:
         print("Anonymization disabled.\n")
+    elif not fuse_qc:
+        anonymize_tree(**an_kwargs)
 
     print("QC")
     print(f"PII QC enabled     : {run_qc}")
@@ -537,12 +1359,44 @@ def main(config_path: str = "config.yaml") -> None:
         print(f"qc_json            : {qc_json_path}")
         print(f"qc_json_detailed   : {qc_json_detailed_path}")
         print(f"pii_keywords       : {pii_keywords}")
+        if pii_matcher is not None:
+            print(f"pii_regex_patterns : {pii_matcher.patterns}")
+            if pii_matcher.rejected:
+                print(f"pii_regex_rejected : {pii_matcher.rejected}")
+            print(f"pii_regex_backend  : {pii_matcher.backend}")
         print(f"inspect_keep_keys  : {inspect_keep_keywords}")
+        print(f"io_workers         : {qc_io_workers}")
+        print(f"parser             : {qc_parser}")
+        print(f"io_uring           : {qc_io_uring}")
+        print(f"mmap               : {qc_use_mmap}")
+        print(f"pretty_json        : {qc_pretty_json}")
         if inspect_keep_keywords:
             print(f"keep_json          : {keep_keywords_json_path}")
+            print(f"keep_json_detailed : {keep_keywords_json_detailed_path}")
+        print(f"fused_qc           : {fuse_qc}")
     print("============================================================\n")
 
-    if run_qc:
+    if fuse_qc:
+        run_anonymization_with_qc(
+            an_kwargs=an_kwargs,
+            qc_root=os.path.normpath(qc_root),
+            valid_exts=qc_valid_exts,
+            qc_json_path=qc_json_path,
+            qc_json_detailed_path=qc_json_detailed_path,
+            keep_json_path=keep_keywords_json_path if inspect_keep_keywords else None,
+            keep_json_detailed_path=keep_keywords_json_detailed_path if inspect_keep_keywords else None,
+            pii_keywords=pii_keywords,
+            pii_matcher=pii_matcher,
+            keep_keywords=list(keep_keywords_sorted) if inspect_keep_keywords else None,
+            keep_patient_id=keep_patient_id,
+            keep_series_instance_uid=keep_series_instance_uid,
+            io_workers=qc_io_workers,
+            parser=qc_parser,
+            io_uring=qc_io_uring,
+            use_mmap=qc_use_mmap,
+            pretty_json=qc_pretty_json,
+        )
+    elif run_qc:
         if not os.path.isdir(qc_root):
             print(f"QC root '{qc_root}' does not exist. Skipping PII QC.")
         else:
@@ -554,6 +1408,12 @@ def main(config_path: str = "config.yaml") -> None:
                 keep_patient_id=keep_patient_id,
                 keep_series_instance_uid=keep_series_instance_uid,
                 pii_keywords=pii_keywords,
+                pii_matcher=pii_matcher,
+                io_workers=qc_io_workers,
+                parser=qc_parser,
+                io_uring=qc_io_uring,
+                use_mmap=qc_use_mmap,
+                pretty_json=qc_pretty_json,
             )
 
         if inspect_keep_keywords:
@@ -565,9 +1425,15 @@ def main(config_path: str = "config.yaml") -> None:
                     qc_root=keep_qc_root,
                     valid_exts=qc_valid_exts,
                     keep_json_path=keep_keywords_json_path,
-                    keep_keywords=sorted(set(keep_keywords_all)),
+                    keep_json_detailed_path=keep_keywords_json_detailed_path,
+                    keep_keywords=list(keep_keywords_sorted),
                     keep_patient_id=keep_patient_id,
                     keep_series_instance_uid=keep_series_instance_uid,
+                    io_workers=qc_io_workers,
+                    parser=qc_parser,
+                    io_uring=qc_io_uring,
+                    use_mmap=qc_use_mmap,
+                    pretty_json=qc_pretty_json,
                 )
     else:
         print("QC disabled.\n")